@@ -1,7 +1,7 @@
 # pylint: disable=no-member
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator
 from datetime import datetime
 from datetime import timedelta
 
@@ -15,22 +15,32 @@ from microdata_tools.validation.exceptions import ValidationError
 logger = logging.getLogger()
 
 
-def _microdata_data_type_to_pyarrow(
-    microdata_data_type: str,
-) -> pyarrow.lib.DataType:
-    if microdata_data_type == "STRING":
-        return pyarrow.string()
-    elif microdata_data_type == "LONG":
-        return pyarrow.int64()
-    elif microdata_data_type == "DOUBLE":
-        return pyarrow.float64()
-    elif microdata_data_type == "DATE":
-        return pyarrow.date32()
-    else:
-        raise ValidationError(
-            "Unsupported measure data type",
-            errors=[f"Unsupported measure data type: {microdata_data_type}"],
-        )
+MICRODATA_TO_PYARROW_DATA_TYPES = {
+    "STRING": pyarrow.string(),
+    "LONG": pyarrow.int64(),
+    "DOUBLE": pyarrow.float64(),
+    "DATE": pyarrow.date32(),
+}
+
+CSV_CONVERT_OPTIONS = {
+    (identifier_data_type, measure_data_type): csv.ConvertOptions(
+        column_types={
+            "unit_id": identifier_pyarrow_type,
+            "value": measure_pyarrow_type,
+            "start": pyarrow.date32(),
+            "stop": pyarrow.date32(),
+            "attributes": pyarrow.string(),
+        }
+    )
+    for (
+        identifier_data_type,
+        identifier_pyarrow_type,
+    ) in MICRODATA_TO_PYARROW_DATA_TYPES.items()
+    for (
+        measure_data_type,
+        measure_pyarrow_type,
+    ) in MICRODATA_TO_PYARROW_DATA_TYPES.items()
+}
 
 
 def _get_csv_read_options():
@@ -41,31 +51,34 @@ def _get_csv_read_options():
 
 def _get_csv_convert_options(
     identifier_data_type: str, measure_data_type: str
-):
-    identifier_pyarrow_type = _microdata_data_type_to_pyarrow(
-        identifier_data_type
-    )
-    measure_pyarrow_type = _microdata_data_type_to_pyarrow(measure_data_type)
-    return csv.ConvertOptions(
-        column_types={
-            "unit_id": identifier_pyarrow_type,
-            "value": measure_pyarrow_type,
-            "start": pyarrow.date32(),
-            "stop": pyarrow.date32(),
-            "attributes": pyarrow.string(),
-        }
-    )
+) -> csv.ConvertOptions:
+    """
+    Looks up the precomputed convert options for the given
+    identifier and measure data types.
+    """
+    try:
+        return CSV_CONVERT_OPTIONS[(identifier_data_type, measure_data_type)]
+    except KeyError as e:
+        unsupported_data_type = (
+            measure_data_type
+            if identifier_data_type in MICRODATA_TO_PYARROW_DATA_TYPES
+            else identifier_data_type
+        )
+        raise ValidationError(
+            "Unsupported measure data type",
+            errors=[f"Unsupported measure data type: {unsupported_data_type}"],
+        ) from e
 
 
-def _csv_to_table(
+def _open_csv(
     input_csv_path: Path, identifier_data_type: str, measure_data_type: str
-) -> pyarrow.Table:
+) -> csv.CSVStreamingReader:
     """
-    Read a csv into a pyarrow table. The read and convert options
+    Open a streaming reader over a csv. The read and convert options
     ensures microdata formatting of the input csv.
     """
     try:
-        return csv.read_csv(
+        return csv.open_csv(
             input_csv_path,
             parse_options=csv.ParseOptions(delimiter=";"),
             read_options=_get_csv_read_options(),
@@ -79,49 +92,123 @@ def _csv_to_table(
         ) from e
 
 
+def _date32_to_int32(column: pyarrow.Array) -> pyarrow.Array:
+    """
+    Reinterpret a pyarrow date32 column as int32 epoch days.
+    A date32 is stored as int32 days since epoch, so this does not
+    copy any data.
+    """
+    return column.view(pyarrow.int32())
+
+
 def _sanitize_unit_id(
-    table: pyarrow.Table, identifier_data_type: str
+    batch: pyarrow.RecordBatch, identifier_data_type: str
 ) -> pyarrow.Array:
     """
     Trim leading and trailing whitespace from the unit_id column
     """
     if identifier_data_type == "STRING":
-        return compute.utf8_trim(table["unit_id"], " ")
+        return compute.ascii_trim(batch["unit_id"], " ")
     else:
-        return table["unit_id"]
+        return batch["unit_id"]
 
 
 def _sanitize_value(
-    table: pyarrow.Table, measure_data_type: str
+    batch: pyarrow.RecordBatch, measure_data_type: str
 ) -> pyarrow.Array:
     """
     Sanitize the value column depending on the measure_data_type
     """
     if measure_data_type == "STRING":
-        return compute.utf8_trim(table["value"], " ")
+        return compute.ascii_trim(batch["value"], " ")
     elif measure_data_type == "DATE":
-        return table["value"].cast(pyarrow.int32()).cast(pyarrow.int64())
+        return _date32_to_int32(batch["value"]).cast(pyarrow.int64())
     else:
-        return table["value"]
+        return batch["value"]
 
 
 def _cast_to_epoch_date(
-    table: pyarrow.Table, column_name: str
+    batch: pyarrow.RecordBatch, column_name: str
 ) -> pyarrow.Array:
     """
     Cast column from pyarrow date (YYYY-MM-DD) to unix epoch days.
+    Epoch days are kept as int32, as dates before 1880 or after 2059
+    do not fit in an int16.
+    """
+    return _date32_to_int32(batch[column_name])
+
+
+def _generate_start_year(batch: pyarrow.RecordBatch) -> pyarrow.Array:
+    """
+    Generates a start year array by extracting the year from the
+    "start" column with pyarrow dates to a string pyarrow.Array (YYYY)
     """
-    return table[column_name].cast(pyarrow.int32()).cast(pyarrow.int16())
+    return compute.year(batch["start"]).cast(pyarrow.string())
 
 
-def _generate_start_year(table: pyarrow.Table) -> pyarrow.Array:
+def _get_sanitized_schema(
+    identifier_data_type: str, measure_data_type: str, temporality_type: str
+) -> pyarrow.Schema:
     """
-    Generates a start year array by substringing the "start" column
-    with pyarrow dates (YYYY-MM-DD) to a string pyarrow.Array (YYYY)
+    Returns the schema of the sanitized table for the given data types
+    and temporality type.
     """
-    return compute.utf8_slice_codeunits(
-        table["start"].cast(pyarrow.string()), start=0, stop=4
+    value_pyarrow_type = (
+        pyarrow.int64()
+        if measure_data_type == "DATE"
+        else MICRODATA_TO_PYARROW_DATA_TYPES[measure_data_type]
     )
+    fields = [
+        pyarrow.field(
+            "unit_id", MICRODATA_TO_PYARROW_DATA_TYPES[identifier_data_type]
+        ),
+        pyarrow.field("value", value_pyarrow_type),
+        pyarrow.field("start_epoch_days", pyarrow.int32()),
+        pyarrow.field("stop_epoch_days", pyarrow.int32()),
+    ]
+    if temporality_type in ["STATUS", "ACCUMULATED"]:
+        fields.append(pyarrow.field("start_year", pyarrow.string()))
+    return pyarrow.schema(fields)
+
+
+def _sanitize_batch(
+    batch: pyarrow.RecordBatch,
+    identifier_data_type: str,
+    measure_data_type: str,
+    schema: pyarrow.Schema,
+) -> pyarrow.RecordBatch:
+    """
+    Sanitizes a single batch of csv rows into the microdata data model.
+    """
+    columns = [
+        _sanitize_unit_id(batch, identifier_data_type),
+        _sanitize_value(batch, measure_data_type),
+        _cast_to_epoch_date(batch, "start"),
+        _cast_to_epoch_date(batch, "stop"),
+    ]
+    if "start_year" in schema.names:
+        columns.append(_generate_start_year(batch))
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _sanitize_batches(
+    reader: csv.CSVStreamingReader,
+    identifier_data_type: str,
+    measure_data_type: str,
+    schema: pyarrow.Schema,
+) -> Iterator[pyarrow.RecordBatch]:
+    """
+    Yields sanitized batches as they are read from the csv reader.
+    """
+    try:
+        for batch in reader:
+            yield _sanitize_batch(
+                batch, identifier_data_type, measure_data_type, schema
+            )
+    except ArrowInvalid as e:
+        raise ValidationError(
+            "Error when reading dataset", errors=[str(e)]
+        ) from e
 
 
 def read_and_sanitize_csv(
@@ -133,21 +220,22 @@ def read_and_sanitize_csv(
     """
     Reads a csv file to a pyarrow table. Sanitizes values and
     ensures the input csv data follows the requirements for the
-    microdata data model.
+    microdata data model. The csv is read and sanitized one batch
+    at a time, and each batch is kept as a separate chunk in the
+    returned table.
     """
-    table = _csv_to_table(
+    reader = _open_csv(
         input_data_path, identifier_data_type, measure_data_type
     )
-    unit_id = _sanitize_unit_id(table, identifier_data_type)
-    value = _sanitize_value(table, measure_data_type)
-    epoch_start = _cast_to_epoch_date(table, "start")
-    epoch_stop = _cast_to_epoch_date(table, "stop")
-    columns = [unit_id, value, epoch_start, epoch_stop]
-    column_names = ["unit_id", "value", "start_epoch_days", "stop_epoch_days"]
-    if temporality_type in ["STATUS", "ACCUMULATED"]:
-        columns.append(_generate_start_year(table))
-        column_names.append("start_year")
-    return pyarrow.Table.from_arrays(columns, column_names)
+    schema = _get_sanitized_schema(
+        identifier_data_type, measure_data_type, temporality_type
+    )
+    return pyarrow.Table.from_batches(
+        _sanitize_batches(
+            reader, identifier_data_type, measure_data_type, schema
+        ),
+        schema=schema,
+    )
 
 
 def get_temporal_data(
@@ -172,29 +260,26 @@ def get_temporal_data(
             datetime(1970, 1, 1) + timedelta(days=stop_max)
         ).strftime("%Y-%m-%d")
     else:
-        start_min, start_max = (
-            compute.min_max(table["start_epoch_days"]).as_py().values()
-        )
-        stop_min, stop_max = (
-            compute.min_max(table["stop_epoch_days"]).as_py().values()
-        )
-        if start_min is None or start_max is None:
+        start_dates = table["start_epoch_days"]
+        stop_dates = table["stop_epoch_days"]
+        if start_dates.null_count == len(start_dates):
             error_string = (
                 "Could not read data in third column (Start date)."
                 " Is this column empty?"
             )
             raise ValidationError(error_string, errors=[error_string])
-        if stop_min is None or stop_max is None:
+        if stop_dates.null_count == len(stop_dates):
             error_string = (
                 "Could not read data in fourth column (Stop date)."
                 " Is this column empty?"
             )
             raise ValidationError(error_string, errors=[error_string])
-        min_date = min(
-            [date for date in [start_min, stop_min] if date is not None]
-        )
-        max_date = max(
-            [date for date in [start_max, stop_max] if date is not None]
+        min_date, max_date = (
+            compute.min_max(
+                pyarrow.chunked_array(start_dates.chunks + stop_dates.chunks)
+            )
+            .as_py()
+            .values()
         )
         temporal_data["start"] = (
             datetime(1970, 1, 1) + timedelta(days=min_date)
@@ -204,12 +289,11 @@ def get_temporal_data(
         ).strftime("%Y-%m-%d")
 
     if temporality_type == "STATUS":
-        temporal_data["statusDates"] = [
-            (datetime(1970, 1, 1) + timedelta(days=status_days)).strftime(
-                "%Y-%m-%d"
-            )
-            for status_days in compute.unique(
-                table["start_epoch_days"]
-            ).to_pylist()
-        ]
+        temporal_data["statusDates"] = (
+            compute.unique(table["start_epoch_days"])
+            .drop_null()
+            .cast(pyarrow.date32())
+            .cast(pyarrow.string())
+            .to_pylist()
+        )
     return temporal_data
@@ -1,12 +1,35 @@
-from typing import List, Union
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Tuple, Union
 
-from pyarrow import dataset, compute, Table
+import numpy
+import pyarrow
+from pyarrow import acero, dataset, compute, Table
 from pyarrow.dataset import FileSystemDataset
 
 from microdata_tools.validation.exceptions import ValidationError
 
 
+# Options shared by every scan of the dataset. Only the columns a check
+# needs are read, and filters are pushed down to the parquet reader.
+SCAN_OPTIONS = {"use_threads": True, "batch_size": 262_144}
+
+
+def _get_invalid_rows(
+    data: FileSystemDataset, invalid_rows_filter: dataset.Expression
+) -> Table:
+    """
+    Returns the unit_id of the first 50 rows matching the filter.
+    The scan stops as soon as 50 rows are found, so only valid
+    datasets are read in full.
+    """
+    return data.head(
+        50, filter=invalid_rows_filter, columns=["unit_id"], **SCAN_OPTIONS
+    )
+
+
 def _get_error_list(invalid_rows: Table, message: str):
     invalid_identifiers = (
         invalid_rows.column("unit_id").slice(0, 50).to_pylist()
@@ -17,86 +40,136 @@ def _get_error_list(invalid_rows: Table, message: str):
     ]
 
 
-def _valid_value_column_check(
+@lru_cache(maxsize=128)
+def _get_unique_codes(codes: Tuple[str, ...]) -> pyarrow.Array:
+    """
+    Returns the deduplicated codes as a pyarrow array. The result is
+    cached, as datasets validated in the same process often share the
+    same code list.
+    """
+    return compute.unique(pyarrow.array(codes, pyarrow.string()))
+
+
+def _count_matching_rows(
+    data: FileSystemDataset,
+    columns: List[str],
+    row_filters: Dict[str, dataset.Expression],
+) -> Dict[str, int]:
+    """
+    Counts the rows matching each of the named filters. All filters
+    are evaluated in a single Acero scan over the given columns.
+    """
+    sum_options = compute.ScalarAggregateOptions(min_count=0)
+    count_matching_rows = acero.Declaration.from_sequence(
+        [
+            acero.Declaration(
+                "scan",
+                acero.ScanNodeOptions(data, columns=columns, **SCAN_OPTIONS),
+            ),
+            acero.Declaration(
+                "project",
+                acero.ProjectNodeOptions(
+                    list(row_filters.values()), list(row_filters.keys())
+                ),
+            ),
+            acero.Declaration(
+                "aggregate",
+                acero.AggregateNodeOptions(
+                    [
+                        (name, "sum", sum_options, name)
+                        for name in row_filters.keys()
+                    ]
+                ),
+            ),
+        ]
+    )
+    return count_matching_rows.to_table().to_pylist()[0]
+
+
+def _valid_unit_id_and_value_check(
     data: FileSystemDataset,
     data_type: str,
     code_list: Union[List, None],
     sentinel_list: Union[List, None],
 ):
     """
+    Any given cell in the unit_id column is valid only if:
+    * The cell contains a a valid non-null value
+    * The cell does not contain an empty string
+
     Any given cell in the value column is valid only if:
     * The cell contains a a valid non-null value
     * The cell does not contain an empty string if data_type is STRING
     * The value is present in the code_list if supplied
     """
+    invalid_unit_id_filter = dataset.field("unit_id").is_null() | (
+        dataset.field("unit_id") == ""
+    )
+
     is_null_filter = dataset.field("value").is_null()
     is_empty_string_filter = dataset.field("value") == ""
-    invalid_rows_filter = (
+    missing_value_filter = (
         (is_null_filter | is_empty_string_filter)
         if data_type == "STRING"
         else is_null_filter
     )
-    invalid_rows = data.to_table(
-        filter=invalid_rows_filter, columns=["unit_id"]
-    )
-    if len(invalid_rows) > 0:
-        raise ValidationError(
-            "#2 column",
-            errors=_get_error_list(invalid_rows, "Invalid value in #2 column"),
-        )
-
+    invalid_code_filter = None
     if code_list:
-        unique_codes = list(
-            set(code_list_item["code"] for code_list_item in code_list)
-        )
+        codes = [code_list_item["code"] for code_list_item in code_list]
         if sentinel_list:
-            unique_codes += list(
-                set(
-                    sentinel_list_item["code"]
-                    for sentinel_list_item in sentinel_list
-                )
-            )
+            codes += [
+                sentinel_list_item["code"]
+                for sentinel_list_item in sentinel_list
+            ]
+        unique_codes = _get_unique_codes(tuple(codes))
         invalid_code_filter = ~dataset.field("value").isin(unique_codes)
-        invalid_rows = data.to_table(
-            filter=invalid_code_filter, columns=["unit_id", "value"]
-        )
-        if len(invalid_rows) > 0:
-            invalid_codes = (
-                invalid_rows.column("value").slice(0, 50).to_pylist()
-            )
-            invalid_unit_ids = (
-                invalid_rows.column("unit_id").slice(0, 50).to_pylist()
-            )
-            invalid_code_rows = list(zip(invalid_unit_ids, invalid_codes))
-
-            raise ValidationError(
-                "#2 column",
-                errors=[
-                    f"Error for identifier {unit_id}: {code} is not in code list"
-                    for (unit_id, code) in invalid_code_rows
-                ],
-            )
-
+    invalid_value_filter = (
+        missing_value_filter
+        if invalid_code_filter is None
+        else missing_value_filter | invalid_code_filter
+    )
 
-def _valid_unit_id_check(data: FileSystemDataset):
-    """
-    Any given cell in the unit_id column is valid only if:
-    * The cell contains a a valid non-null value
-    * The cell does not contain an empty string
-    """
-    is_null_filter = dataset.field("unit_id").is_null()
-    is_empty_string_filter = dataset.field("unit_id") == ""
-    invalid_rows_filter = is_null_filter | is_empty_string_filter
-    invalid_rows = data.to_table(
-        filter=invalid_rows_filter, columns=["unit_id"]
+    # Count invalid rows for both columns in a single scan, and only
+    # collect rows for the error message if any are found
+    invalid_rows_count = _count_matching_rows(
+        data,
+        ["unit_id", "value"],
+        {"unit_id": invalid_unit_id_filter, "value": invalid_value_filter},
     )
-    if len(invalid_rows) > 0:
+    if invalid_rows_count["unit_id"] > 0:
+        invalid_rows = _get_invalid_rows(data, invalid_unit_id_filter)
         raise ValidationError(
             "#1 column",
             errors=_get_error_list(
                 invalid_rows, "Invalid identifier in #1 column"
             ),
         )
+    if invalid_rows_count["value"] == 0:
+        return
+
+    invalid_rows = _get_invalid_rows(data, missing_value_filter)
+    if len(invalid_rows) > 0:
+        raise ValidationError(
+            "#2 column",
+            errors=_get_error_list(invalid_rows, "Invalid value in #2 column"),
+        )
+
+    invalid_rows = data.head(
+        50,
+        filter=invalid_code_filter,
+        columns=["unit_id", "value"],
+        **SCAN_OPTIONS,
+    )
+    invalid_codes = invalid_rows.column("value").to_pylist()
+    invalid_unit_ids = invalid_rows.column("unit_id").to_pylist()
+    invalid_code_rows = list(zip(invalid_unit_ids, invalid_codes))
+    raise ValidationError(
+        "#2 column",
+        errors=[
+            f"Error for identifier {unit_id}: {code} is not in code list"
+            for (unit_id, code) in invalid_code_rows
+        ],
+    )
 
 
 def _fixed_temporal_variables_check(data: FileSystemDataset):
@@ -107,9 +180,8 @@ def _fixed_temporal_variables_check(data: FileSystemDataset):
     """
     start_is_valid_filter = dataset.field("start_epoch_days").is_valid()
     stop_is_null_filter = dataset.field("stop_epoch_days").is_null()
-    invalid_rows = data.to_table(
-        filter=start_is_valid_filter | stop_is_null_filter,
-        columns=["unit_id"],
+    invalid_rows = _get_invalid_rows(
+        data, start_is_valid_filter | stop_is_null_filter
     )
     if len(invalid_rows) > 0:
         raise ValidationError(
@@ -128,12 +200,12 @@ def _status_temporal_variables_check(data: FileSystemDataset):
     * The start_epoch_days and stop_epoch_days columns contain the same value
       for any given row
     """
-    invalid_rows = data.to_table(
-        filter=(
+    invalid_rows = _get_invalid_rows(
+        data,
+        (
             dataset.field("stop_epoch_days").is_null()
             | dataset.field("start_epoch_days").is_null()
         ),
-        columns=["unit_id"],
     )
     if len(invalid_rows) > 0:
         raise ValidationError(
@@ -142,10 +214,9 @@ def _status_temporal_variables_check(data: FileSystemDataset):
                 invalid_rows, "Invalid #3 and/or #4 columns"
             ),
         )
-    invalid_rows = data.to_table(
-        filter=dataset.field("start_epoch_days")
-        != dataset.field("stop_epoch_days"),
-        columns=["unit_id"],
+    invalid_rows = _get_invalid_rows(
+        data,
+        dataset.field("start_epoch_days") != dataset.field("stop_epoch_days"),
     )
     if len(invalid_rows) > 0:
         raise ValidationError(
@@ -167,9 +238,8 @@ def _event_temporal_variables_check(data: FileSystemDataset):
     start_bt_stop_filter = dataset.field("start_epoch_days") > dataset.field(
         "stop_epoch_days"
     )  # If stop_epoch_days is null this test will be ignored by pyarrow
-    invalid_rows = data.to_table(
-        filter=(start_is_null_filter | start_bt_stop_filter),
-        columns=["unit_id"],
+    invalid_rows = _get_invalid_rows(
+        data, start_is_null_filter | start_bt_stop_filter
     )
     if len(invalid_rows) > 0:
         raise ValidationError(
@@ -191,11 +261,9 @@ def _accumulated_temporal_variables_check(data: FileSystemDataset):
     start_be_stop_filter = dataset.field("start_epoch_days") >= dataset.field(
         "stop_epoch_days"
     )
-    invalid_rows = data.to_table(
-        filter=(
-            start_is_null_filter | stop_is_null_filter | start_be_stop_filter
-        ),
-        columns=["unit_id"],
+    invalid_rows = _get_invalid_rows(
+        data,
+        start_is_null_filter | stop_is_null_filter | start_be_stop_filter,
     )
     if len(invalid_rows) > 0:
         raise ValidationError(
@@ -211,28 +279,31 @@ def _only_unique_identifiers_check(data: FileSystemDataset):
     A table with temporalityType=FIXED is only valid if all
     cells in the unit_id column are unique.
     """
-    identifiers = data.to_table(columns=["unit_id"])
-    identifiers = Table.from_arrays(
-        [
-            compute.utf8_slice_codeunits(
-                identifiers["unit_id"], start=0, stop=1
-            ),
-            identifiers["unit_id"],
-        ],
-        names=["bucket", "unit_id"],
+    # Count all and distinct identifiers while streaming over the
+    # dataset, without loading the unit_id column as a whole
+    scan_identifiers = acero.Declaration(
+        "scan",
+        acero.ScanNodeOptions(data, columns=["unit_id"], **SCAN_OPTIONS),
+    )
+    count_identifiers = acero.Declaration(
+        "aggregate",
+        acero.AggregateNodeOptions(
+            [
+                ("unit_id", "count", None, "row_count"),
+                ("unit_id", "count_distinct", None, "unique_count"),
+            ]
+        ),
+    )
+    identifier_counts = (
+        acero.Declaration.from_sequence([scan_identifiers, count_identifiers])
+        .to_table()
+        .to_pylist()[0]
     )
-    unique_buckets = compute.unique(identifiers["bucket"])
-    for unique_bucket in unique_buckets:
-        bucket_table = identifiers.filter(
-            dataset.field("bucket") == unique_bucket
+    if identifier_counts["unique_count"] != identifier_counts["row_count"]:
+        raise ValidationError(
+            "#1 column",
+            errors=["Duplicate identifiers in #1 column"],
         )
-        bucket_row_count = len(bucket_table)
-        unique_identifiers_count = len(compute.unique(bucket_table["unit_id"]))
-        if unique_identifiers_count != bucket_row_count:
-            raise ValidationError(
-                "#1 column",
-                errors=["Duplicate identifiers in #1 column"],
-            )
 
 
 def _status_uniquesness_check(data: FileSystemDataset):
@@ -240,22 +311,20 @@ def _status_uniquesness_check(data: FileSystemDataset):
     A table with temporalityType=STATUS is valid only if all
     cells in the unit_id column are unique per status date.
     """
-    all_status_dates = data.to_table(columns=["start_epoch_days"])
-    unique_status_dates = compute.unique(all_status_dates["start_epoch_days"])
-    for status_date in unique_status_dates:
-        status_table = data.to_table(
-            columns=["unit_id"],
-            filter=dataset.field("start_epoch_days") == status_date,
+    status_rows = data.to_table(
+        columns=["start_epoch_days", "unit_id"], **SCAN_OPTIONS
+    )
+    unique_status_rows = status_rows.group_by(
+        ["start_epoch_days", "unit_id"]
+    ).aggregate([])
+    if len(unique_status_rows) != len(status_rows):
+        raise ValidationError(
+            "#1, #3 and #4 columns",
+            errors=[
+                "Same unit_id (#1 Column) has duplicate dates "
+                "(#3 and #4 column)"
+            ],
         )
-        unique_identifiers = compute.unique(status_table["unit_id"])
-        if len(unique_identifiers) != len(status_table):
-            raise ValidationError(
-                "#1, #3 and #4 columns",
-                errors=[
-                    "Same unit_id (#1 Column) has duplicate dates "
-                    "(#3 and #4 column)"
-                ],
-            )
 
 
 def _no_overlapping_timespans_check(data: FileSystemDataset):
@@ -274,71 +343,71 @@ def _no_overlapping_timespans_check(data: FileSystemDataset):
             )
         )
 
-    def find_overlap(start_list, stop_list) -> Union[str, None]:
-        """
-        Looks for overlapping timespans where each timespan
-        is defined by a start_date at an index from the start_list,
-        and a stop_date at the same index from the stop_list.
-        """
-        for i in range(len(start_list) - 1):
-            if stop_list[i] is None:
-                return (
-                    f"timespan: ({from_epoch_days_to_date(start_list[i])} - "
-                    ") overlaps with "
-                    f"timespan: ({from_epoch_days_to_date(start_list[i + 1])} - "
-                    f"{from_epoch_days_to_date(stop_list[i + 1])})"
-                )
-            if stop_list[i] > start_list[i + 1]:
-                return (
-                    f"timespan: ({from_epoch_days_to_date(start_list[i])} - "
-                    f"{from_epoch_days_to_date(stop_list[i])}) overlaps with timespan: "
-                    f"({from_epoch_days_to_date(start_list[i+1])} - "
-                    f"{from_epoch_days_to_date(stop_list[i+1])})"
-                )
-        return None
-
-    def batch(iterable, batch_size):
-        for index in range(0, len(iterable), batch_size):
-            yield iterable[index : index + batch_size]
-
-    identifiers = data.to_table(columns=["unit_id"])
-    unique_identifiers = compute.unique(identifiers["unit_id"])
-    error_list = []
-    for identifier_batch in batch(unique_identifiers, 500_000):
-        identifier_time_spans = data.to_table(
-            filter=dataset.field("unit_id").isin(identifier_batch),
-            columns=["unit_id", "start_epoch_days", "stop_epoch_days"],
-        )
-        identifier_time_spans = identifier_time_spans.sort_by(
-            [("start_epoch_days", "ascending")]
+    timespans = data.to_table(
+        columns=["unit_id", "start_epoch_days", "stop_epoch_days"],
+        **SCAN_OPTIONS,
+    ).sort_by([("unit_id", "ascending"), ("start_epoch_days", "ascending")])
+    if len(timespans) < 2:
+        return
+    unit_ids = timespans["unit_id"]
+    start_dates = timespans["start_epoch_days"]
+    stop_dates = timespans["stop_epoch_days"]
+
+    def to_timespan(index: int) -> str:
+        start_date = from_epoch_days_to_date(start_dates[index].as_py())
+        stop_date = from_epoch_days_to_date(stop_dates[index].as_py())
+        return f"timespan: ({start_date} - {stop_date})"
+
+    # Compare each timespan with the next timespan in the sorted table.
+    # A timespan without a stop date overlaps any following timespan.
+    next_row_count = len(timespans) - 1
+    same_identifier = compute.equal(
+        unit_ids.slice(0, next_row_count), unit_ids.slice(1)
+    ).to_numpy(zero_copy_only=False)
+    start_days = start_dates.cast(pyarrow.int32()).fill_null(0).to_numpy()
+    stop_days = stop_dates.cast(pyarrow.int32()).fill_null(0).to_numpy()
+    stop_is_null = stop_dates.is_null().to_numpy(zero_copy_only=False)
+    overlaps_next = (stop_days[:-1] > start_days[1:]) | stop_is_null[:-1]
+    overlap_indices = numpy.flatnonzero(same_identifier & overlaps_next)
+
+    # Number the identifiers in sorted order, and keep only
+    # the first overlap found for each identifier
+    identifier_numbers = numpy.cumsum(~same_identifier)
+    first_overlap_indices = overlap_indices[
+        numpy.diff(identifier_numbers[overlap_indices], prepend=-1) != 0
+    ]
+
+    error_list = [
+        (
+            "Invalid overlapping timespans for identifier"
+            f' "{unit_ids[index]}": {to_timespan(index)} overlaps with '
+            f"{to_timespan(index + 1)}"
         )
-        identifier_time_spans = identifier_time_spans.group_by(
-            "unit_id", use_threads=False
-        ).aggregate(
-            [("start_epoch_days", "list"), ("stop_epoch_days", "list")]
+        for index in first_overlap_indices[:50].tolist()
+    ]
+    if error_list:
+        raise ValidationError(
+            "#1, #3 and #4 columns",
+            errors=error_list,
         )
-        for i in range(len(identifier_time_spans)):
-            overlap_message = find_overlap(
-                identifier_time_spans["start_epoch_days_list"][i].as_py(),
-                identifier_time_spans["stop_epoch_days_list"][i].as_py(),
-            )
-            if overlap_message is not None:
-                error_list.append(
-                    (
-                        "Invalid overlapping timespans for identifier"
-                        f' "{identifier_time_spans["unit_id"][i]}": {overlap_message}'
-                    )
-                )
-            if len(error_list) > 49:
-                raise ValidationError(
-                    "#1, #3 and #4 columns",
-                    errors=error_list,
-                )
-        if error_list:
-            raise ValidationError(
-                "#1, #3 and #4 columns",
-                errors=error_list,
-            )
+
+
+def _run_concurrently(checks: List[Callable[[], None]]) -> None:
+    """
+    Runs independent checks in a thread pool. Arrow releases the GIL
+    while scanning, so the checks run in parallel. If any checks fail,
+    the error of the first failing check in the given order is raised.
+    """
+    max_workers = min(len(checks), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(check) for check in checks]
+        try:
+            for future in futures:
+                future.result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
 
 
 def validate_dataset(
@@ -348,19 +417,30 @@ def validate_dataset(
     sentinel_list: Union[List, None],
     temporality_type: str,
 ) -> None:
-    _valid_unit_id_check(data)
-    _valid_value_column_check(
-        data, measure_data_type, code_list, sentinel_list
-    )
+    # Row level checks read separate columns and can run in parallel
+    row_checks = [
+        partial(
+            _valid_unit_id_and_value_check,
+            data,
+            measure_data_type,
+            code_list,
+            sentinel_list,
+        ),
+    ]
     if temporality_type == "FIXED":
-        _fixed_temporal_variables_check(data)
-        _only_unique_identifiers_check(data)
+        row_checks.append(partial(_fixed_temporal_variables_check, data))
     elif temporality_type == "STATUS":
-        _status_temporal_variables_check(data)
-        _status_uniquesness_check(data)
+        row_checks.append(partial(_status_temporal_variables_check, data))
     elif temporality_type == "ACCUMULATED":
-        _accumulated_temporal_variables_check(data)
-        _no_overlapping_timespans_check(data)
+        row_checks.append(partial(_accumulated_temporal_variables_check, data))
     elif temporality_type == "EVENT":
-        _event_temporal_variables_check(data)
+        row_checks.append(partial(_event_temporal_variables_check, data))
+    _run_concurrently(row_checks)
+
+    # Checks across rows assume that every row is valid
+    if temporality_type == "FIXED":
+        _only_unique_identifiers_check(data)
+    elif temporality_type == "STATUS":
+        _status_uniquesness_check(data)
+    elif temporality_type in ["ACCUMULATED", "EVENT"]:
         _no_overlapping_timespans_check(data)
@@ -96,6 +96,14 @@ FIXED_STRING_INVALID_DS = _dataset_from_dict(
         "value": ["ab", "", None, "3"],
     },
 )
+FIXED_STRING_INVALID_UNIT_ID_DS = _dataset_from_dict(
+    "FIXED_STRING_INVALID_UNIT_ID_DS",
+    {
+        **_FIXED_DS_TEMPLATE,
+        "unit_id": ["1", "", "3", None],
+        "value": ["ab", "", None, "3"],
+    },
+)
 
 FIXED_LONG_DS = _dataset_from_dict(
     "FIXED_LONG_DS",
@@ -219,6 +227,16 @@ EVENT_TOO_MANY_ERRORS_DS = _dataset_from_dict(
         "stop_epoch_days": [None] * 200,
     },
 )
+EVENT_MULTIPLE_OVERLAPS_DS = _dataset_from_dict(
+    "EVENT_MULTIPLE_OVERLAPS_DS",
+    {
+        "unit_id": ["2", "1", "1", "2", "1"],
+        "value": ["1", "2", "3", "4", "5"],
+        "start_year": ["2020"] * 5,
+        "start_epoch_days": [18630, 18628, 18626, 18626, 18627],
+        "stop_epoch_days": [18650, 18631, None, 18640, 18630],
+    },
+)
 
 # -------------------------
 # TEMPORALITY: ACCUMULATED
@@ -19,8 +19,8 @@ EXPECTED_COLUMNS = {
 def test_get_temporal_data():
     table_schema = pyarrow.schema(
         [
-            pyarrow.field("start_epoch_days", pyarrow.int16()),
-            pyarrow.field("stop_epoch_days", pyarrow.int16()),
+            pyarrow.field("start_epoch_days", pyarrow.int32()),
+            pyarrow.field("stop_epoch_days", pyarrow.int32()),
         ]
     )
     fixed_dict = {
@@ -39,7 +39,7 @@ def test_get_temporal_data():
         "start_epoch_days": [1, 2, 3, 4, 5],
         "stop_epoch_days": [1, 2, 3, 4, 5],
     }
-    empty_table = {
+    empty_dict = {
         "start_epoch_days": [None, None, None, None, None],
         "stop_epoch_days": [None, None, None, None, None],
     }
@@ -73,6 +73,7 @@ def test_get_temporal_data():
             "1970-01-06",
         ],
     }
+    empty_table = pyarrow.Table.from_pydict(empty_dict, schema=table_schema)
     with pytest.raises(ValidationError) as e:
         data_reader.get_temporal_data(empty_table, "EVENT")
     assert e.value.errors == [
@@ -94,7 +95,8 @@ def test_sanitize_long():
             invalid_data_path, "STRING", "LONG", "FIXED"
         )
     assert e.value.errors == [
-        "In CSV column #1: CSV conversion error to int64: invalid value 'abc123'"
+        "In CSV column #1: Row #1: CSV conversion error to int64: "
+        "invalid value 'abc123'"
     ]
 
 
@@ -112,8 +114,8 @@ def test_sanitize_double():
             invalid_data_path, "STRING", "DOUBLE", "FIXED"
         )
     assert e.value.errors == [
-        "In CSV column #1: CSV conversion error to double: invalid value "
-        "'12345,12345'"
+        "In CSV column #1: Row #1: CSV conversion error to double: "
+        "invalid value '12345,12345'"
     ]
 
 
@@ -131,8 +133,8 @@ def test_sanitize_date():
             invalid_data_path, "STRING", "DATE", "FIXED"
         )
     assert e.value.errors == [
-        "In CSV column #1: CSV conversion error to date32[day]: invalid value "
-        "'2020-13-01'"
+        "In CSV column #1: Row #2: CSV conversion error to date32[day]: "
+        "invalid value '2020-13-01'"
     ]
 
 
@@ -153,8 +155,8 @@ def test_sanitize_data_invalid_start_stop():
             invalid_data_path, "STRING", "STRING", "FIXED"
         )
     assert e.value.errors == [
-        "In CSV column #3: CSV conversion error to date32[day]: invalid value "
-        "'2020-13-01'"
+        "In CSV column #3: Row #1: CSV conversion error to date32[day]: "
+        "invalid value '2020-13-01'"
     ]
 
 
@@ -165,7 +167,8 @@ def test_sanitize_data_wrong_delimiter():
             invalid_data_path, "STRING", "STRING", "FIXED"
         )
     assert e.value.errors == [
-        "CSV parse error: Expected 5 columns, got 1: 000001,abc123,2020-01-01,"
+        "CSV parse error: Row #1: Expected 5 columns, got 1: "
+        "000001,abc123,2020-01-01,"
     ]
 
 
@@ -200,3 +203,40 @@ def test_sanitize_data_start_year():
         "start_epoch_days": [17897, 18262, 18262],
         "stop_epoch_days": [18261, 18627, 18627],
     }
+
+
+def test_sanitize_multiple_batches(tmp_path):
+    # Large enough to span several csv blocks
+    row_count = 200_000
+    data_path = tmp_path / "STRING_MULTIPLE_BATCHES.csv"
+    with open(data_path, "w", encoding="utf-8") as f:
+        for i in range(row_count):
+            f.write(f" {i:06};abc123 ;2020-01-01;2020-12-31;\n")
+    table = data_reader.read_and_sanitize_csv(
+        data_path, "STRING", "STRING", "ACCUMULATED"
+    )
+    assert len(table) == row_count
+    assert table["unit_id"].num_chunks > 1
+    assert table["unit_id"][row_count - 1].as_py() == f"{row_count - 1:06}"
+    assert table["value"].unique().to_pylist() == ["abc123"]
+    assert table["start_year"].unique().to_pylist() == ["2020"]
+
+
+def test_sanitize_dates_outside_int16_range(tmp_path):
+    data_path = tmp_path / "STRING_WIDE_DATE_RANGE.csv"
+    with open(data_path, "w", encoding="utf-8") as f:
+        f.write("000001;abc123;1850-01-01;2099-12-31;\n")
+    table = data_reader.read_and_sanitize_csv(
+        data_path, "STRING", "STRING", "EVENT"
+    )
+    assert table.schema.field("start_epoch_days").type == pyarrow.int32()
+    assert table.to_pydict() == {
+        "unit_id": ["000001"],
+        "value": ["abc123"],
+        "start_epoch_days": [-43829],
+        "stop_epoch_days": [47481],
+    }
+    assert data_reader.get_temporal_data(table, "EVENT") == {
+        "start": "1850-01-01",
+        "latest": "2099-12-31",
+    }
@@ -50,6 +50,19 @@ def test_measure_data_type_string_validation():
         "Invalid value in #2 column for row with identifier: 2",
         "Invalid value in #2 column for row with identifier: 3",
     ]
+    # The unit_id error is reported even if the value column is invalid
+    with pytest.raises(ValidationError) as e:
+        dataset_validator.validate_dataset(
+            test_data.FIXED_STRING_INVALID_UNIT_ID_DS,
+            "STRING",
+            None,
+            None,
+            "FIXED",
+        )
+    assert e.value.errors == [
+        "Invalid identifier in #1 column for row with identifier: ",
+        "Invalid identifier in #1 column for row with identifier: None",
+    ]
 
 
 def test_measure_data_type_long_validation():
@@ -222,6 +235,26 @@ def test_temporality_event():
             "EVENT",
         )
     assert len(e.value.errors) == 50
+    with pytest.raises(ValidationError) as e:
+        dataset_validator.validate_dataset(
+            test_data.EVENT_MULTIPLE_OVERLAPS_DS,
+            "STRING",
+            None,
+            None,
+            "EVENT",
+        )
+    assert e.value.errors == [
+        (
+            'Invalid overlapping timespans for identifier "1": '
+            "timespan: (2020-12-30 - ) overlaps with "
+            "timespan: (2020-12-31 - 2021-01-03)"
+        ),
+        (
+            'Invalid overlapping timespans for identifier "2": '
+            "timespan: (2020-12-30 - 2021-01-13) overlaps with "
+            "timespan: (2021-01-03 - 2021-01-23)"
+        ),
+    ]
 
 
 def test_temporality_accumulated():